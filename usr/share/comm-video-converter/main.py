@@ -8,6 +8,8 @@ import sys
 import gi
 from collections import deque
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
@@ -53,6 +55,13 @@ class VideoConverterApp(Adw.Application):
 
         # Initialize state variables
         self.conversions_running = 0
+        # Guards conversions_running, which monitor threads decrement
+        self.conversions_lock = threading.Lock()
+        # Bounded pool of reusable threads that monitor running conversions
+        self.monitor_pool = ThreadPoolExecutor(
+            max_workers=max(2, os.cpu_count() or 1),
+            thread_name_prefix="conversion-monitor",
+        )
         self.progress_widgets = []
         self.previous_page = "conversion"
         self.conversion_queue = deque()
@@ -143,15 +152,28 @@ class VideoConverterApp(Adw.Application):
 
     def _on_window_close_request(self, window):
         """Handle window close event to clean up running processes"""
+        self._terminate_active_conversions()
+
+        # Continue with normal window close
+        return False  # False means continue with close, True would prevent close
+
+    def _terminate_active_conversions(self):
+        """Terminate the processes of all conversions still running"""
+        progress_page = getattr(self, "progress_page", None)
         # Check if we have active conversions
-        if self.progress_page and self.progress_page.has_active_conversions():
+        if progress_page and progress_page.has_active_conversions():
             # Terminate all running processes
             for (
                 conversion_id,
                 conversion,
-            ) in self.progress_page.active_conversions.items():
+            ) in progress_page.active_conversions.items():
                 conversion_item = conversion["item"]
-                if conversion_item and conversion_item.process:
+                # Skip finished items, and ones close-request already ended
+                if (
+                    conversion_item
+                    and conversion_item.process
+                    and conversion_item.process.poll() is None
+                ):
                     try:
                         print(
                             f"Terminating process {conversion_item.process.pid} on application exit"
@@ -160,9 +182,6 @@ class VideoConverterApp(Adw.Application):
                     except Exception as e:
                         print(f"Error terminating process on exit: {e}")
 
-        # Continue with normal window close
-        return False  # False means continue with close, True would prevent close
-
     def terminate_process_tree(self, process):
         """Properly terminate a process and all its children"""
         if not process:
@@ -786,6 +805,14 @@ class VideoConverterApp(Adw.Application):
             return False
 
     # GIO Application overrides
+    def do_shutdown(self):
+        """Stop running conversions so quitting never waits for an encode"""
+        # Quit from the menu doesn't emit close-request, so terminate here too;
+        # the monitors then see end of file and finish right away
+        self._terminate_active_conversions()
+        self.monitor_pool.shutdown(wait=False, cancel_futures=True)
+        Adw.Application.do_shutdown(self)
+
     def do_open(self, files, n_files, hint):
         """Handle files opened via file association or from another instance"""
         # Ensure window exists
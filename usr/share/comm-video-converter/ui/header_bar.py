@@ -15,9 +15,29 @@ class HeaderBar(Gtk.Box):
     Custom header bar with tabs and buttons for settings and menu.
     """
 
+    # Translated labels, filled on first construction. Translations can't be
+    # looked up at import time because the text domain is bound later in main().
+    _labels = None
+
+    @classmethod
+    def _get_labels(cls):
+        """Return the translated header labels, looking them up only once"""
+        if cls._labels is None:
+            cls._labels = {
+                "conversion": _("Conversion"),
+                "edit": _("Video Edit"),
+                "settings": _("Settings"),
+                "menu": _("Menu"),
+                "about": _("About"),
+                "help": _("Help"),
+                "quit": _("Quit"),
+            }
+        return cls._labels
+
     def __init__(self, app):
         super().__init__(orientation=Gtk.Orientation.HORIZONTAL)
         self.app = app
+        labels = self._get_labels()
 
         # Garantir que o Box ocupe toda a largura
         self.set_hexpand(True)
@@ -34,17 +54,17 @@ class HeaderBar(Gtk.Box):
         self.tab_box.set_halign(Gtk.Align.CENTER)
 
         # Create tab buttons
-        self.conversion_button = Gtk.Button(label=_("Conversion"))
+        self.conversion_button = Gtk.Button(label=labels["conversion"])
         self.conversion_button.connect("clicked", self._on_tab_clicked, "conversion")
         self.conversion_button.add_css_class("suggested-action")
         self.tab_box.append(self.conversion_button)
 
-        self.preview_button = Gtk.Button(label=_("Video Edit"))
+        self.preview_button = Gtk.Button(label=labels["edit"])
         self.preview_button.connect("clicked", self._on_tab_clicked, "edit")
         self.tab_box.append(self.preview_button)
 
         # Add settings tab button - treat it like other tabs
-        self.settings_button = Gtk.Button(label=_("Settings"))
+        self.settings_button = Gtk.Button(label=labels["settings"])
         self.settings_button.connect("clicked", self._on_tab_clicked, "settings")
         self.tab_box.append(self.settings_button)
 
@@ -55,19 +75,22 @@ class HeaderBar(Gtk.Box):
             "settings": self.settings_button,
         }
 
+        # Name of the tab whose button currently carries the highlight (or None)
+        self._active_tab = "conversion"
+
         # Set title widget for header bar
         self.header_bar.set_title_widget(self.tab_box)
 
         # Add menu button (three dots)
         self.menu_button = Gtk.MenuButton()
         self.menu_button.set_icon_name("open-menu-symbolic")
-        self.menu_button.set_tooltip_text(_("Menu"))
+        self.menu_button.set_tooltip_text(labels["menu"])
 
         # Create menu model
         menu = Gio.Menu.new()
-        menu.append(_("About"), "app.about")
-        menu.append(_("Help"), "app.help")
-        menu.append(_("Quit"), "app.quit")
+        menu.append(labels["about"], "app.about")
+        menu.append(labels["help"], "app.help")
+        menu.append(labels["quit"], "app.quit")
 
         self.menu_button.set_menu_model(menu)
         self.header_bar.pack_end(self.menu_button)
@@ -79,11 +102,17 @@ class HeaderBar(Gtk.Box):
 
     def activate_tab(self, tab_name):
         """Update button styling to reflect current tab"""
-        for name, button in self.tab_buttons.items():
-            if name == tab_name:
-                button.add_css_class("suggested-action")
-            else:
-                button.remove_css_class("suggested-action")
+        # Only the previously and newly active buttons need a CSS change.
+        # Pages without a tab (e.g. progress) leave no button highlighted.
+        if tab_name not in self.tab_buttons:
+            tab_name = None
+        if tab_name == self._active_tab:
+            return
+        if self._active_tab is not None:
+            self.tab_buttons[self._active_tab].remove_css_class("suggested-action")
+        if tab_name is not None:
+            self.tab_buttons[tab_name].add_css_class("suggested-action")
+        self._active_tab = tab_name
 
     def set_tabs_sensitive(self, sensitive):
         """Enable or disable tab buttons"""
@@ -135,6 +135,7 @@ class ConversionItem(Gtk.Box):
         self.conversion_id = conversion_id
         self.cancelled = False
         self.success = False
+        self.is_queue_processing = False  # Set by run_with_progress_dialog
 
         # Remove the command pattern detection as it's now handled in conversion.py
         self.current_encode_mode = _("Unknown")
@@ -1,25 +1,52 @@
 import os
 import subprocess
 import json
+import threading
+from fractions import Fraction
 import gi
 
 gi.require_version("Gtk", "4.0")
-gi.require_version("GdkPixbuf", "2.0")
-from gi.repository import GLib, Gio, Gdk, GdkPixbuf
+from gi.repository import GLib, Gdk
 
 # Setup translation
 import gettext
 
 _ = gettext.gettext
 
+# Parameters of FFmpeg's eq filter and their neutral values, in filter order
+_EQ_PARAMS = (
+    "brightness",
+    "contrast",
+    "saturation",
+    "gamma",
+    "gamma_r",
+    "gamma_g",
+    "gamma_b",
+    "gamma_weight",
+)
+_EQ_DEFAULTS = (0.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+# Preview frame width used before the preview widget has been allocated
+_FALLBACK_PREVIEW_WIDTH = 640
+
 
 class VideoProcessor:
     def __init__(self, page):
         self.page = page
+        # Bumped by every load and frame request; an async frame is only shown
+        # if no newer request was made while FFmpeg was running
+        self._frame_generation = 0
+        # Display rotation of the loaded video in degrees (0, 90, 180 or 270)
+        self._rotation = 0
 
     def load_video(self, file_path):
         """Load video metadata and extract the first frame"""
-        if not file_path or not os.path.exists(file_path):
+        self._frame_generation += 1
+
+        # A single stat both validates the path and provides the size fallback
+        try:
+            file_stat = os.stat(file_path)
+        except (OSError, TypeError, ValueError):
             print(f"Cannot load video - invalid path: {file_path}")
             return False
 
@@ -54,19 +81,19 @@ class VideoProcessor:
                 print("Error: No video stream found")
                 return False
 
+            format_info = info.get("format", {})
+
             # Get video dimensions
             self.page.video_width = int(video_stream.get("width", 0))
             self.page.video_height = int(video_stream.get("height", 0))
+            self._rotation = self._stream_rotation(video_stream)
 
             # Get video duration (in seconds)
-            duration_str = video_stream.get("duration") or info.get("format", {}).get(
-                "duration"
-            )
+            duration_str = video_stream.get("duration") or format_info.get("duration")
             if duration_str:
                 self.page.video_duration = float(duration_str)
             else:
                 # If duration not available, estimate it from bitrate and filesize
-                format_info = info.get("format", {})
                 if "size" in format_info and "bit_rate" in format_info:
                     size_bytes = float(format_info["size"])
                     bit_rate = float(format_info["bit_rate"])
@@ -75,22 +102,33 @@ class VideoProcessor:
             # Update position slider range
             self.page.ui.position_scale.set_range(0, self.page.video_duration)
 
-            # Get FPS info
-            fps = video_stream.get("avg_frame_rate", "unknown").split("/")
-            if len(fps) == 2 and int(fps[1]) != 0:
-                fps_value = round(int(fps[0]) / int(fps[1]), 2)
-                # Store fps for frame calculations
-                self.page.video_fps = fps_value
-            else:
-                fps_value = "unknown"
-                self.page.video_fps = 30  # Default to 30fps if unknown
+            # Set current position to middle of video for better initial preview
+            # (first frame is often black or blank)
+            self.page.current_position = self.page.video_duration / 2
+
+            # Update slider to middle position
+            self.page.ui.position_scale.set_value(self.page.current_position)
+
+            # Start extracting the middle frame now; the remaining metadata is
+            # formatted while FFmpeg decodes and the frame is shown on idle
+            self._extract_frame_async(self.page.current_position)
+
+            # Get FPS info - Fraction parses "num/den" (and plain numbers) in one step
+            try:
+                fps_value = float(Fraction(video_stream.get("avg_frame_rate") or "0"))
+            except (ZeroDivisionError, ValueError):
+                fps_value = 0.0
+
+            # Store fps for frame calculations, default to 30fps if unknown
+            self.page.video_fps = fps_value or 30.0
+            fps_display = round(fps_value, 2) if fps_value else "unknown"
 
             # Get file size and format it
             file_size_bytes = 0
             try:
-                file_size_bytes = int(info.get("format", {}).get("size", 0))
+                file_size_bytes = int(format_info.get("size", 0))
             except (ValueError, TypeError):
-                file_size_bytes = os.path.getsize(file_path)
+                file_size_bytes = file_stat.st_size
 
             # Format file size
             if file_size_bytes < 1024:
@@ -113,8 +151,7 @@ class VideoProcessor:
                 duration_str = f"{minutes}m {seconds}s"
 
             # Update all info labels
-            filename = os.path.basename(file_path)
-            self.page.ui.info_filename_label.set_text(filename)
+            self.page.ui.info_filename_label.set_text(os.path.basename(file_path))
             self.page.ui.info_dimensions_label.set_text(
                 f"{self.page.video_width}×{self.page.video_height}"
             )
@@ -123,23 +160,12 @@ class VideoProcessor:
             )
 
             # Get and display format_long_name
-            format_info = info.get("format", {})
             format_long_name = format_info.get("format_long_name", "Unknown format")
             self.page.ui.info_format_label.set_text(format_long_name)
 
             self.page.ui.info_filesize_label.set_text(file_size_str)
             self.page.ui.info_duration_label.set_text(duration_str)
-            self.page.ui.info_fps_label.set_text(f"{fps_value} fps")
-
-            # Set current position to middle of video for better initial preview
-            # (first frame is often black or blank)
-            self.page.current_position = self.page.video_duration / 2
-
-            # Update slider to middle position
-            self.page.ui.position_scale.set_value(self.page.current_position)
-
-            # Extract a frame from the middle of the video
-            self.extract_frame(self.page.current_position)
+            self.page.ui.info_fps_label.set_text(f"{fps_display} fps")
 
             return True
 
@@ -155,135 +181,222 @@ class VideoProcessor:
 
     def extract_frame(self, position):
         """Extract a frame at the specified position using FFmpeg directly to memory"""
+        self._frame_generation += 1
         try:
-            # Validate position is within valid range
-            safe_end = max(0, self.page.video_duration - 0.1)
-            if position >= safe_end:
-                position = safe_end
-                # Update current_position and slider without triggering events
-                self.page.current_position = position
-                if hasattr(self.page.ui, "position_scale") and hasattr(
-                    self.page, "position_changed_handler_id"
-                ):
-                    self.page.ui.position_scale.handler_block(
-                        self.page.position_changed_handler_id
-                    )
-                    self.page.ui.position_scale.set_value(position)
-                    self.page.ui.position_scale.handler_unblock(
-                        self.page.position_changed_handler_id
-                    )
-
-            # Build filter string for FFmpeg
-            filters = []
-
-            # Add crop filter if needed
-            if (
-                self.page.crop_left > 0
-                or self.page.crop_right > 0
-                or self.page.crop_top > 0
-                or self.page.crop_bottom > 0
-            ):
-                crop_width = (
-                    self.page.video_width - self.page.crop_left - self.page.crop_right
-                )
-                crop_height = (
-                    self.page.video_height - self.page.crop_top - self.page.crop_bottom
-                )
-                filters.append(
-                    f"crop={crop_width}:{crop_height}:{self.page.crop_left}:{self.page.crop_top}"
-                )
+            position = self._clamp_position(position)
+            cmd, width = self._build_frame_command(position)
+            return self._show_frame(self._run_frame_command(cmd), width, position)
 
-            # Add hue adjustment
-            if self.page.hue != 0.0:
-                hue_degrees = self.page.hue * 180 / 3.14159
-                filters.append(f"hue=h={hue_degrees}")
-
-            # Add color adjustments
-            eq_parts = []
-            if self.page.brightness != 0:
-                eq_parts.append(f"brightness={self.page.brightness}")
-            if self.page.contrast != 1.0:
-                contrast_delta = self.page.contrast - 1.0
-                ff_contrast = 1.0 + (contrast_delta * 2.0)
-                eq_parts.append(f"contrast={ff_contrast}")
-            if self.page.saturation != 1.0:
-                eq_parts.append(f"saturation={self.page.saturation}")
-            if self.page.gamma != 1.0:
-                eq_parts.append(f"gamma={self.page.gamma}")
-            if self.page.gamma_r != 1.0:
-                eq_parts.append(f"gamma_r={self.page.gamma_r}")
-            if self.page.gamma_g != 1.0:
-                eq_parts.append(f"gamma_g={self.page.gamma_g}")
-            if self.page.gamma_b != 1.0:
-                eq_parts.append(f"gamma_b={self.page.gamma_b}")
-            if self.page.gamma_weight != 1.0:
-                eq_parts.append(f"gamma_weight={self.page.gamma_weight}")
-
-            if eq_parts:
-                filters.append("eq=" + ":".join(eq_parts))
-
-            filter_arg = ",".join(filters) if filters else "null"
-
-            # Optimized FFmpeg command - using MJPEG which is faster to encode/decode than PNG
-            cmd = [
-                "ffmpeg",
-                "-loglevel",
-                "error",  # Reduce log output for performance
-                "-ss",
-                str(position),
-                "-i",
-                self.page.current_video_path,
-                "-vf",
-                filter_arg,
-                "-vframes",
-                "1",
-                "-c:v",
-                "mjpeg",  # Use MJPEG instead of PNG - much faster
-                "-q:v",
-                "3",  # Quality setting (1-31, lower is better)
-                "-f",
-                "image2pipe",
-                "-",
-            ]
-
-            # Execute FFmpeg directly and capture output
-            process = subprocess.run(cmd, capture_output=True, check=False)
-
-            if process.returncode != 0:
-                print(
-                    f"FFmpeg error: {process.stderr.decode('utf-8', errors='replace')}"
-                )
-                return False
+        except Exception as e:
+            print(f"Error extracting frame: {e}")
+            import traceback
 
-            # Create a memory input stream directly from the stdout bytes
-            if process.stdout:
-                # Convert the byte data directly to a memory stream
-                input_stream = Gio.MemoryInputStream.new_from_bytes(
-                    GLib.Bytes.new(process.stdout)
-                )
+            traceback.print_exc()
+            return False
 
-                # Create a pixbuf from the stream first
-                pixbuf = GdkPixbuf.Pixbuf.new_from_stream(input_stream, None)
+    def _extract_frame_async(self, position):
+        """Run FFmpeg for a frame on a worker thread and display it from the main loop"""
+        self._frame_generation += 1
+        generation = self._frame_generation
+        position = self._clamp_position(position)
+        # The command reads page state, so build it here on the main thread
+        cmd, width = self._build_frame_command(position)
+        video_path = self.page.current_video_path
 
-                # Then create a texture from the pixbuf
-                texture = Gdk.Texture.new_for_pixbuf(pixbuf)
+        def worker():
+            try:
+                data = self._run_frame_command(cmd)
+            except Exception as e:
+                print(f"Error extracting frame: {e}")
+                data = None
+            GLib.idle_add(
+                self._on_async_frame_ready,
+                data,
+                width,
+                position,
+                video_path,
+                generation,
+            )
 
-                # Set the image in the UI
-                self.page.ui.preview_image.set_paintable(texture)
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_async_frame_ready(self, data, width, position, video_path, generation):
+        """Show a frame produced by _extract_frame_async unless it went stale"""
+        # Drop the frame if another video was loaded, the user already seeked,
+        # or a newer frame was requested, e.g. after a filter changed
+        if (
+            generation == self._frame_generation
+            and video_path == self.page.current_video_path
+            and abs(position - self.page.current_position) < 0.001
+        ):
+            try:
+                self._show_frame(data, width, position)
+            except Exception as e:
+                print(f"Error displaying frame: {e}")
+        return False  # Don't repeat
+
+    def _clamp_position(self, position):
+        """Keep the position inside the video, syncing the slider if it moved"""
+        safe_end = max(0, self.page.video_duration - 0.1)
+        if position >= safe_end:
+            position = safe_end
+            # Update current_position and slider without triggering events
+            self.page.current_position = position
+            if hasattr(self.page.ui, "position_scale") and hasattr(
+                self.page, "position_changed_handler_id"
+            ):
+                self.page.ui.position_scale.handler_block(
+                    self.page.position_changed_handler_id
+                )
+                self.page.ui.position_scale.set_value(position)
+                self.page.ui.position_scale.handler_unblock(
+                    self.page.position_changed_handler_id
+                )
+        return position
+
+    def _build_frame_command(self, position):
+        """Build the FFmpeg command that renders a single preview frame.
+
+        Returns:
+            tuple: (command list, width of the raw RGBA output)
+        """
+        # Build filter string for FFmpeg
+        filters = []
+        frame_width = self.page.video_width
+        frame_height = self.page.video_height
+
+        # Add crop filter if needed
+        if (
+            self.page.crop_left > 0
+            or self.page.crop_right > 0
+            or self.page.crop_top > 0
+            or self.page.crop_bottom > 0
+        ):
+            crop_width = (
+                self.page.video_width - self.page.crop_left - self.page.crop_right
+            )
+            crop_height = (
+                self.page.video_height - self.page.crop_top - self.page.crop_bottom
+            )
+            filters.append(
+                f"crop={crop_width}:{crop_height}:{self.page.crop_left}:{self.page.crop_top}"
+            )
+            frame_width, frame_height = crop_width, crop_height
+
+        # Add hue adjustment
+        if self.page.hue != 0.0:
+            hue_degrees = self.page.hue * 180 / 3.14159
+            filters.append(f"hue=h={hue_degrees}")
+
+        # Add color adjustments
+        eq_parts = []
+        for name, default in zip(_EQ_PARAMS, _EQ_DEFAULTS):
+            value = getattr(self.page, name)
+            if value == default:
+                continue
+            if name == "contrast":
+                # Map UI contrast delta onto FFmpeg's wider contrast range
+                value = 1.0 + ((value - 1.0) * 2.0)
+            eq_parts.append(f"{name}={value}")
+
+        if eq_parts:
+            filters.append("eq=" + ":".join(eq_parts))
+
+        # Scale to the preview width so the raw frame stays small. Only the
+        # width is fixed: FFmpeg applies the video's rotation before the
+        # filters, so the height follows the frame's real shape
+        width = self._preview_width(frame_width, frame_height)
+        filters.append(f"scale={width}:-2")
+
+        filter_arg = ",".join(filters)
+
+        # Raw RGBA output goes straight into a texture - no image encode/decode
+        cmd = [
+            "ffmpeg",
+            "-loglevel",
+            "error",  # Reduce log output for performance
+            "-ss",
+            str(position),
+            "-i",
+            self.page.current_video_path,
+            "-vf",
+            filter_arg,
+            "-vframes",
+            "1",
+            "-pix_fmt",
+            "rgba",
+            "-f",
+            "rawvideo",
+            "-",
+        ]
+        return cmd, width
+
+    def _preview_width(self, frame_width, frame_height):
+        """Pick an even output width matching the preview widget in device pixels"""
+        preview = self.page.ui.preview_image
+        # Widget sizes are logical; HiDPI displays need scale_factor times more
+        width = preview.get_width() * preview.get_scale_factor()
+        if width <= 0:
+            # Not allocated yet - fall back to a typical preview width
+            width = _FALLBACK_PREVIEW_WIDTH
+
+        # The coded size is before rotation; FFmpeg turns the frame before the
+        # filters, so a quarter turn swaps which side is displayed as width.
+        # Going past the displayed width would only upscale
+        display_width = frame_height if self._rotation in (90, 270) else frame_width
+        if display_width > 0:
+            width = min(width, display_width)
+
+        return max(2, width // 2 * 2)
+
+    @staticmethod
+    def _stream_rotation(video_stream):
+        """Return the stream's display rotation in degrees, normalised to 0-359"""
+        # Newer FFmpeg reports a display matrix, older ones a "rotate" tag
+        rotation = video_stream.get("tags", {}).get("rotate", 0)
+        for side_data in video_stream.get("side_data_list", []):
+            if "rotation" in side_data:
+                rotation = side_data["rotation"]
+        try:
+            return int(float(rotation)) % 360
+        except (TypeError, ValueError):
+            return 0
+
+    def _run_frame_command(self, cmd):
+        """Execute a frame command and return the image bytes (safe off the main thread)"""
+        # Execute FFmpeg directly and capture output
+        process = subprocess.run(cmd, capture_output=True, check=False)
+
+        if process.returncode != 0:
+            print(f"FFmpeg error: {process.stderr.decode('utf-8', errors='replace')}")
+            return None
+
+        return process.stdout
+
+    def _show_frame(self, data, width, position):
+        """Display raw RGBA frame bytes in the preview and update position tracking"""
+        stride = width * 4
+        # The height is whatever the scale filter produced for this width
+        height = len(data) // stride if data else 0
+        if not height:
+            print("Error: No image data received from ffmpeg")
+            return False
 
-                # Update position tracking
-                self.page.current_position = position
-                self.page.update_position_display(position)
-                self.page.update_frame_counter(position)
+        # Wrap the pixels in a texture directly
+        texture = Gdk.MemoryTexture.new(
+            width,
+            height,
+            Gdk.MemoryFormat.R8G8B8A8,
+            GLib.Bytes.new(data[: stride * height]),
+            stride,
+        )
 
-                return True
-            else:
-                print("Error: No image data received from ffmpeg")
-                return False
+        # Set the image in the UI
+        self.page.ui.preview_image.set_paintable(texture)
 
-        except Exception as e:
-            print(f"Error extracting frame: {e}")
-            import traceback
+        # Update position tracking
+        self.page.current_position = position
+        self.page.update_position_display(position)
+        self.page.update_frame_counter(position)
 
-            traceback.print_exc()
-            return False
+        return True
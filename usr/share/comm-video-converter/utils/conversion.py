@@ -1,9 +1,14 @@
 import os
+import codecs
 import subprocess
 import shlex
 import threading
 import re
+import select
+import selectors
+import signal
 import time
+from collections import deque
 from gi.repository import GLib
 
 from constants import CONVERT_SCRIPT_PATH
@@ -13,6 +18,249 @@ import gettext
 
 _ = gettext.gettext  # Will use the already initialized translation
 
+# FFmpeg output patterns, compiled once per process.
+# Both are matched at the start of the stripped line. Header and script lines
+# carry one token each, and the outer group name of the match
+# (match.lastgroup) tells which one was found.
+_FFMPEG_LINE_RE = re.compile(
+    r"(?P<duration>Duration: (?P<duration_value>"
+    r"(?P<duration_h>\d+):(?P<duration_m>\d+):(?P<duration_s>\d+)\.(?P<duration_cs>\d+)))"
+    r"|(?P<output>Output #0.*?'(?P<output_value>.*?)')"
+    r"|(?P<video_fps>Stream #\d+:\d+.*Video:.*\s(?P<video_fps_value>\d+(?:\.\d+)?)\s*fps)"
+    # Lines printed by the conversion script itself
+    r"|(?P<mode>Encode mode:\s*(?P<mode_value>.*))"
+    r"|(?P<command>Running command:\s*(?P<command_value>.*))",
+    re.ASCII,  # FFmpeg prints ASCII digits; skips Unicode class lookups
+)
+# Periodic stats lines ("frame=... fps=... time=...") yield all their values
+# from one anchored match; audio-only output starts at size= with no frames
+_FFMPEG_STATS_RE = re.compile(
+    r"(?:frame=\s*(?P<frame_value>\d+)\s+)?"
+    r"(?:fps=\s*(?P<fps_value>\d+\.?\d*)\s+)?"
+    r"(?:.*?time=(?P<time_value>"
+    r"(?P<time_h>\d+):(?P<time_m>\d+):(?P<time_s>\d+)\.(?P<time_cs>\d+)))?",
+    re.ASCII,
+)
+# Tokens a stats match can hold, paired with the group that holds the value
+_STATS_TOKENS = (("frame", "frame_value"), ("fps", "fps_value"), ("time", "time_value"))
+
+# Line starts of FFmpeg's periodic stats
+_STATS_LINE_PREFIXES = ("frame=", "size=")
+# Starts of the other lines the monitor parses once indentation is stripped:
+# FFmpeg header entries and the conversion script's notes
+_HEADER_LINE_PREFIXES = (
+    "Duration:",
+    "Output #0",
+    "Stream #",
+    "Encode mode:",
+    "Running command:",
+)
+
+# Fallback for stream lines that only report tbr
+_ALT_FPS_RE = re.compile(r"Video:.*?(\d+(?:\.\d+)?)\s*(?:tbr|fps)", re.ASCII)
+# Groups holding the hours, minutes, seconds and fraction of each timestamp
+_TIMESTAMP_GROUPS = {
+    name: (f"{name}_h", f"{name}_m", f"{name}_s", f"{name}_cs")
+    for name in ("time", "duration")
+}
+
+# Per-line diagnostics from the monitor thread are only printed when set
+_DEBUG = bool(os.environ.get("COMM_VIDEO_DEBUG"))
+
+# Largest read from a conversion process pipe
+_READ_CHUNK_SIZE = 1 << 16
+
+# Settings passed to the conversion script by build_convert_command, paired
+# with the environment variable each one is exported as
+_CONVERT_SETTING_ENV_KEYS = tuple(
+    (key, key.replace("-", "_"))
+    for key in (
+        "gpu",
+        "video-quality",
+        "video-codec",
+        "preset",
+        "subtitle-extract",
+        "audio-handling",
+        "audio-bitrate",
+        "audio-channels",
+        "video-resolution",
+        "additional-options",
+        "gpu-partial",
+        "force-copy-video",
+        "only-extract-subtitles",
+        "output-folder",
+    )
+)
+
+
+# Translated completion messages, filled in on first use by _get_messages()
+_messages = None
+
+
+def _get_messages():
+    """Return the translated completion messages, looking them up only once"""
+    global _messages
+    if _messages is None:
+        _messages = {
+            "completed": _("Completed!"),
+            "success": _("Conversion completed successfully!"),
+            "error": _("Error!"),
+            "failed": _("Conversion failed with code {0}"),
+            "failed_dialog": _(
+                "The conversion failed with error code {0}.\n\n"
+                "Check the log for more details."
+            ),
+            "cancelled": _("Conversion cancelled."),
+            "cancelled_label": _("Cancelled"),
+        }
+    return _messages
+
+
+class UIBatcher:
+    """
+    Coalesces UI updates for a conversion item into periodic main-loop flushes.
+
+    The monitor thread queues output text and overwrites the latest progress
+    and status; a GLib timer applies everything pending once per interval, so
+    FFmpeg's output rate no longer means one main-loop dispatch per line.
+    Progress and status are applied by the timer itself, while the costlier
+    terminal text insert waits for a low-priority idle so redraws go first.
+    Progress that rounds to the percentage already shown, and an unchanged
+    status, are dropped instead of being applied again.
+    """
+
+    def __init__(self, progress_item, interval=100):
+        self.progress_item = progress_item
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._output = deque()
+        self._progress = None
+        self._status = None
+        self._source_id = None
+        self._deferred_output = []  # Main thread only
+        self._output_source_id = None
+        # What the widgets currently show; main thread only
+        self._shown_percent = None
+        self._shown_status = None
+
+    def start(self):
+        """Start the periodic flush timer"""
+        self._source_id = GLib.timeout_add(self.interval, self._flush)
+
+    def stop(self):
+        """Apply whatever is pending and stop the timer.
+
+        Safe to call from any thread. The final flush is queued with idle_add
+        at the default priority, so it runs before idle callbacks the caller
+        schedules afterwards at the same or a lower priority; callbacks queued
+        at a higher priority, such as PRIORITY_HIGH_IDLE, still run first.
+        """
+        GLib.idle_add(self._finish)
+
+    def append_output(self, text):
+        """Queue text for the terminal view"""
+        with self._lock:
+            self._output.append(text)
+
+    def set_progress(self, fraction, text=None):
+        """Record the latest progress, replacing any value not yet shown"""
+        with self._lock:
+            self._progress = (fraction, text)
+
+    def set_status(self, status):
+        """Record the latest status message, replacing any not yet shown"""
+        with self._lock:
+            self._status = status
+
+    def _finish(self):
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+        self._flush()
+        # Write any deferred text now so it lands before completion messages
+        if self._output_source_id is not None:
+            GLib.source_remove(self._output_source_id)
+            self._apply_output()
+        return False  # Remove from idle queue
+
+    def _apply_output(self):
+        self._output_source_id = None
+        output = "".join(self._deferred_output)
+        self._deferred_output.clear()
+        self.progress_item.add_output_text(output)
+        return False  # Remove from idle queue
+
+    def _flush(self):
+        with self._lock:
+            output = "".join(self._output)
+            self._output.clear()
+            progress, self._progress = self._progress, None
+            status, self._status = self._status, None
+
+        if output:
+            self._deferred_output.append(output)
+            if self._output_source_id is None:
+                self._output_source_id = GLib.idle_add(
+                    self._apply_output, priority=GLib.PRIORITY_LOW
+                )
+        if progress is not None:
+            fraction, text = progress
+            percent = (int(fraction * 100), text)
+            if percent != self._shown_percent:
+                self._shown_percent = percent
+                self.progress_item.update_progress(fraction, text)
+        if status is not None and status != self._shown_status:
+            self._shown_status = status
+            self.progress_item.update_status(status)
+        return True  # Keep the timer running until _finish removes it
+
+
+def _timestamp_seconds(match, name):
+    """Convert the HH:MM:SS.fraction timestamp captured for name into seconds"""
+    h, m, s, fraction = match.group(*_TIMESTAMP_GROUPS[name])
+    # FFmpeg prints hundredths, but scale by the digits actually captured
+    return (
+        int(h) * 3600 + int(m) * 60 + int(s) + int(fraction) / 10 ** len(fraction)
+    )
+
+
+# Line terminators FFmpeg and the conversion script may use; unlike
+# str.splitlines, form feeds, vertical tabs and Unicode separators stay put
+_LINE_END_RE = re.compile(r"\r\n|\r|\n")
+
+
+class _LineSplitter:
+    """
+    Split raw pipe output, fed in chunks, into decoded lines.
+
+    Each chunk is decoded in one call; the incremental decoder carries any
+    UTF-8 sequence split across reads over to the next chunk. FFmpeg ends
+    progress updates with a bare carriage return, so CR, LF and CRLF all end
+    a line. Every returned line ends with a single newline.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+        self._after_cr = False  # Last text ended in CR; a leading LF completes CRLF
+
+    def feed(self, chunk):
+        """Return the lines completed by chunk; an empty chunk (EOF) flushes the rest"""
+        final = not chunk
+        text = self._decoder.decode(chunk, final=final)
+        if text:
+            if self._after_cr and text.startswith("\n"):
+                text = text[1:]
+            self._after_cr = text.endswith("\r")
+
+        lines = _LINE_END_RE.split(self._pending + text)
+        # The last piece has no line terminator yet
+        self._pending = lines.pop()
+        if final and self._pending:
+            lines.append(self._pending)
+            self._pending = ""
+        return [line + "\n" for line in lines]
+
 
 def format_resolution(width, height):
     """
@@ -37,19 +285,19 @@ def run_with_progress_dialog(
     if hasattr(app, "delete_original_after_conversion"):
         delete_original = app.delete_original_after_conversion
 
-    # Initialize env_vars if None
-    if env_vars is None:
-        env_vars = os.environ.copy()
+    # Without caller settings, collect only our overrides; the process
+    # inherits everything else rather than us copying the whole environment
+    inherit_env = env_vars is None
+    if inherit_env:
+        env_vars = {}
 
     # Handle output folder settings - Critical fix for path duplication
-    output_folder = app.settings_manager.load_setting("output-folder", "")
-    if output_folder and output_folder.strip():
-        # Make sure it's absolute and normalized
-        output_folder = os.path.normpath(os.path.abspath(output_folder.strip()))
-
-        # Set in environment with no trailing slash to prevent path issues
-        if output_folder.endswith(os.sep):
-            output_folder = output_folder[:-1]
+    output_folder = app.settings_manager.load_setting("output-folder", "") or ""
+    output_folder = output_folder.strip()
+    if output_folder:
+        # Make sure it's absolute and normalized; normpath also drops any
+        # trailing slash, which would otherwise cause path issues
+        output_folder = os.path.normpath(os.path.abspath(output_folder))
 
         env_vars["output_folder"] = output_folder
         print(f"Set output folder: {output_folder}")
@@ -74,15 +322,15 @@ def run_with_progress_dialog(
         else:
             title_suffix = _("Video Conversion")
 
-    cmd_str = " ".join([shlex.quote(arg) for arg in cmd])
-
     # Increment counter of active conversions
-    app.conversions_running += 1
+    with app.conversions_lock:
+        app.conversions_running += 1
 
     # Start process
     try:
-        # Print command for debugging
-        print(f"Executing command: {cmd_str}")
+        # Print command for debugging; quoting every argument is only worth it then
+        if _DEBUG:
+            print(f"Executing command: {shlex.join(cmd)}")
 
         # Create a process with proper flags to ensure child processes are terminated
         kwargs = {}
@@ -117,14 +365,20 @@ def run_with_progress_dialog(
         ]):
             print(f"  {key}={env_vars[key]}")
 
-        # Use PIPE for stdout and stderr to monitor progress
+        if inherit_env:
+            # Popen's env=None inherits os.environ as is
+            env_vars = {**os.environ, **env_vars} if env_vars else None
+
+        # FFmpeg and the convert script report everything on stderr, so
+        # only that stream is piped for monitoring. Nothing is ever written
+        # to stdin; /dev/null gives FFmpeg's key handling an immediate EOF
         process = subprocess.Popen(
             cmd,
-            stdout=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
-            stdin=subprocess.PIPE,
-            universal_newlines=True,
-            bufsize=1,
+            stdin=subprocess.DEVNULL,
+            # Unbuffered binary pipe; monitor_progress reads the fd directly
+            bufsize=0,
             env=env_vars,
             **kwargs,
         )
@@ -141,73 +395,60 @@ def run_with_progress_dialog(
         # Flag to indicate it's a queue item if queue has files
         is_queue_processing = len(app.conversion_queue) > 0
         progress_item.is_queue_processing = is_queue_processing
-        progress_item.input_file_path = input_file  # Store the input file path
-
-        # Also store the input file path in progress_item for later reference
-        progress_item.original_input_file = input_file
 
         # Configure option to delete original file
         if input_file:
             progress_item.set_delete_original(delete_original)
 
-        # Start thread to monitor progress
-        monitor_thread = threading.Thread(
-            target=monitor_progress, args=(app, process, progress_item)
-        )
-        monitor_thread.daemon = True
-        monitor_thread.start()
+        # Monitor progress on the application's shared worker pool
+        future = app.monitor_pool.submit(monitor_progress, app, process, progress_item)
+        future.add_done_callback(_report_monitor_error)
 
         # Function to handle process completion
         def on_conversion_complete(process, result):
             try:
                 # Cleanup if we were asked to delete the original file after successful conversion
-                if (
-                    result == 0
-                    and delete_original
-                    and input_file
-                    and os.path.exists(input_file)
-                ):
+                if result == 0 and delete_original and input_file:
                     try:
                         os.remove(input_file)
                         print(f"Deleted original file: {input_file}")
+                    except FileNotFoundError:
+                        pass  # Already gone, nothing to clean up
                     except Exception as del_error:
                         print(f"Error deleting file {input_file}: {del_error}")
 
                 # Notify the application that conversion is complete
-                GLib.idle_add(lambda: app.conversion_completed(result == 0))
+                GLib.idle_add(app.conversion_completed, result == 0)
 
             except Exception as e:
                 print(f"Error in conversion completion handler: {e}")
                 # Still notify app even if there's an error in the handler
-                GLib.idle_add(lambda: app.conversion_completed(False))
+                GLib.idle_add(app.conversion_completed, False)
 
     except Exception as e:
         app.show_error_dialog(_("Error starting conversion: {0}").format(e))
         import traceback
 
         traceback.print_exc()
-        app.conversions_running -= 1
-
+        with app.conversions_lock:
+            app.conversions_running -= 1
 
-def monitor_progress(app, process, progress_item):
-    """Monitor the progress of a running conversion process"""
-    # More accurate patterns for FFmpeg output
-    time_pattern = re.compile(r"time=(\d+:\d+:\d+\.\d+)")
-    duration_pattern = re.compile(r"Duration: (\d+:\d+:\d+\.\d+)")
-    output_file_pattern = re.compile(r"Output #0.*?\'(.*?)\'")
 
-    # Add patterns for frame count tracking
-    frame_pattern = re.compile(r"frame=\s*(\d+)")
-    fps_pattern = re.compile(r"fps=\s*(\d+\.?\d*)")
+def _report_monitor_error(future):
+    """Print an exception that escaped monitor_progress on the worker pool"""
+    # The pool keeps exceptions in the future instead of printing them
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        import traceback
 
-    # Multiple patterns to get fps from various parts of FFmpeg output
-    video_fps_pattern = re.compile(r"Stream #\d+:\d+.*Video:.*\s(\d+(?:\.\d+)?)\s*fps")
-    alt_fps_pattern = re.compile(r"Video:.*?(\d+(?:\.\d+)?)\s*(?:tbr|fps)")
+        print(f"Error in conversion monitor: {error}")
+        traceback.print_exception(type(error), error, error.__traceback__)
 
-    # Encode mode and command patterns
-    encode_mode_pattern = re.compile(r"Encode mode:\s*(.*)")
-    running_command_pattern = re.compile(r"Running command:\s*(.*)")
 
+def monitor_progress(app, process, progress_item):
+    """Monitor the progress of a running conversion process"""
     # Map technical encode modes to user-friendly translations
     encode_mode_map = {
         "": _("Software encoding"),
@@ -216,9 +457,14 @@ def monitor_progress(app, process, progress_item):
         "Decode Software, Encode Software": _("Software encoding"),
     }
 
+    # Translated once here rather than for every progress line
+    speed_label = _("Speed:")
+
     # Track when we detect the encode mode
     encode_mode_detected = False
     encode_mode = _("Unknown")  # Default value
+    # Display name for encode_mode, updated only when a new mode is detected
+    friendly_mode = encode_mode
     full_command = None
 
     # Values to track progress
@@ -226,8 +472,11 @@ def monitor_progress(app, process, progress_item):
     duration_str = None
     current_time_secs = 0
     output_file = None
-    last_output_time = time.time()
-    processing_start_time = time.time()
+    # Elapsed times use the monotonic clock so wall-clock jumps can't skew them
+    processing_start_time = time.monotonic()
+    # Warn once the process has been silent past this point; pushed back by
+    # new output, and to infinity once reported so a stall warns only once
+    stall_deadline = processing_start_time + 15
 
     # Variables for frame-based progress tracking
     total_frames = None
@@ -238,13 +487,17 @@ def monitor_progress(app, process, progress_item):
     # Flag to track duration detection
     duration_detected = False
 
-    # Variables for improved time estimation
-    progress_samples = []
+    # Variables for improved time estimation; the deque drops the oldest sample
     sample_window = 10
+    progress_samples = deque(maxlen=sample_window)
+
+    # UI updates from this thread are applied in batches on the main loop
+    ui = UIBatcher(progress_item)
+    ui.start()
 
     # Set initial status
-    GLib.idle_add(progress_item.update_status, _("Starting process..."))
-    GLib.idle_add(progress_item.add_output_text, _("Starting FFmpeg process..."))
+    ui.set_status(_("Starting process..."))
+    ui.append_output(_("Starting FFmpeg process..."))
 
     # Helper function to get user-friendly encode mode
     def get_friendly_encode_mode(technical_mode):
@@ -274,84 +527,87 @@ def monitor_progress(app, process, progress_item):
         friendly_mode = get_friendly_encode_mode(encode_mode)
 
         if fps_value is not None:
-            status_msg = f"{_('Speed')}: {fps_display} fps\n{friendly_mode}"
+            status_msg = f"{speed_label} {fps_display} fps\n{friendly_mode}"
         else:
             status_msg = f"{friendly_mode}"
 
-        GLib.idle_add(progress_item.update_status, status_msg)
+        ui.set_status(status_msg)
         return friendly_mode
 
+    # The stderr pipe is watched from this thread; the selector timeout
+    # drives the stall check, so no reader thread or queue is needed
+    selector = selectors.DefaultSelector()
     try:
-        import threading
-
-        # Queue to collect output from both streams
-        from queue import Queue, Empty
-
-        output_queue = Queue()
-
-        # Threads to read from stdout and stderr
-        def read_stdout():
-            for line in iter(process.stdout.readline, ""):
-                if line:
-                    output_queue.put(("stdout", line))
-            output_queue.put(("stdout_end", None))
-
-        def read_stderr():
-            for line in iter(process.stderr.readline, ""):
-                if line:
-                    output_queue.put(("stderr", line))
-            output_queue.put(("stderr_end", None))
-
-        # Start reader threads
-        stdout_thread = threading.Thread(target=read_stdout)
-        stderr_thread = threading.Thread(target=read_stderr)
-        stdout_thread.daemon = True
-        stderr_thread.daemon = True
-        stdout_thread.start()
-        stderr_thread.start()
-
-        # Flags to track when streams are done
-        stdout_done = False
-        stderr_done = False
-
-        # Process lines from both outputs as they come in
-        while not (stdout_done and stderr_done) and not progress_item.was_cancelled():
+        selector.register(process.stderr, selectors.EVENT_READ)
+        splitter = _LineSplitter()
+
+        # Lines read but not processed yet; None marks end of file
+        ready = deque()
+
+        def read_ready(timeout):
+            for key, _events in selector.select(timeout):
+                chunk = os.read(key.fd, _READ_CHUNK_SIZE)
+                ready.extend(splitter.feed(chunk))
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    ready.append(None)
+
+        # Process lines as they come in until the pipe closes
+        while not progress_item.was_cancelled():
             try:
-                try:
-                    source, line = output_queue.get(timeout=0.1)
-                except Empty:
+                if not ready:
+                    read_ready(0.1)
+                    # One clock read per pipe read serves the stall check and
+                    # the elapsed times of every line it produced
+                    now = time.monotonic()
+                    if ready:
+                        # Reset timeout counter whenever new output arrives
+                        stall_deadline = now + 15
+                if not ready:
                     # This is normal - just check if we should continue waiting
-                    if time.time() - last_output_time > 15:
+                    if now > stall_deadline:
+                        stall_deadline = float("inf")
                         timeout_msg = _("No progress detected. Process may be stuck.")
-                        GLib.idle_add(progress_item.update_status, timeout_msg)
-                        GLib.idle_add(progress_item.add_output_text, timeout_msg)
+                        ui.set_status(timeout_msg)
+                        ui.append_output(timeout_msg)
                         print("Process may be stuck - no output for 15 seconds")
                     continue
 
-                if source == "stdout_end":
-                    stdout_done = True
-                    continue
-                elif source == "stderr_end":
-                    stderr_done = True
-                    continue
-
-                # Reset timeout counter with each line of output
-                last_output_time = time.time()
-
-                # Skip processing if line is None
+                line = ready.popleft()
                 if line is None:
-                    continue
+                    break
 
                 # Print the raw output for debugging with a simpler format
-                print(f"FFMPEG: {line.strip()}")
-
-                # Send output to terminal view
-                GLib.idle_add(progress_item.add_output_text, line)
+                if _DEBUG:
+                    print(f"FFMPEG: {line.strip()}")
+
+                head = line.lstrip()
+                is_stats = head.startswith(_STATS_LINE_PREFIXES)
+
+                # Send output to terminal view, except FFmpeg's periodic
+                # "frame=... time=..." stats, which only feed the progress bar
+                if not (is_stats and "time=" in line):
+                    ui.append_output(line)
+
+                # Match the tokens we track anchored at the line start; a
+                # prefix test skips the regex for all other lines
+                if is_stats:
+                    stats = _FFMPEG_STATS_RE.match(head)
+                    found = {
+                        name: stats
+                        for name, group in _STATS_TOKENS
+                        if stats.group(group) is not None
+                    }
+                elif head.startswith(_HEADER_LINE_PREFIXES):
+                    match = _FFMPEG_LINE_RE.match(head)
+                    found = {match.lastgroup: match} if match else {}
+                else:
+                    found = {}
 
-                # Check for encode mode in both stdout and stderr
-                mode_match = encode_mode_pattern.search(line)
+                # Check for the encode mode announced by the convert script
+                mode_match = found.get("mode")
                 if mode_match:
-                    detected_mode = mode_match.group(1).strip()
+                    detected_mode = mode_match.group("mode_value").strip()
                     if detected_mode:  # Make sure we got a non-empty string
                         encode_mode = detected_mode
                         encode_mode_detected = True
@@ -359,153 +615,122 @@ def monitor_progress(app, process, progress_item):
                         # Get user-friendly mode name using helper function
                         friendly_mode = get_friendly_encode_mode(detected_mode)
 
-                        print(f"Detected encode mode from {source}: {encode_mode}")
-                        print(f"Converted to friendly mode: {friendly_mode}")
+                        if _DEBUG:
+                            print(f"Detected encode mode: {encode_mode}")
+                            print(f"Converted to friendly mode: {friendly_mode}")
 
-                        GLib.idle_add(
-                            progress_item.add_output_text,
-                            f"Detected encode mode: {encode_mode} ({friendly_mode})",
+                        ui.append_output(
+                            f"Detected encode mode: {encode_mode} ({friendly_mode})"
                         )
 
                         # Update the UI immediately with the friendly encode mode
-                        GLib.idle_add(progress_item.update_status, f"{friendly_mode}")
+                        ui.set_status(f"{friendly_mode}")
 
                 # Check for FFmpeg command
-                cmd_match = running_command_pattern.search(line)
+                cmd_match = found.get("command")
                 if cmd_match:
-                    detected_cmd = cmd_match.group(1).strip()
+                    detected_cmd = cmd_match.group("command_value").strip()
                     if detected_cmd:  # Make sure we got a non-empty string
                         # Update the command text display in the UI
-                        GLib.idle_add(
-                            lambda: progress_item.cmd_text.set_text(detected_cmd)
-                        )
+                        GLib.idle_add(progress_item.cmd_text.set_text, detected_cmd)
 
                         # Don't automatically expand the command expander anymore
                         # Let the user click on it when they want to see the command
 
                         # Add as a special entry to the terminal with highlighting
                         highlight_text = f"\n{_('FFmpeg command')}:\n{detected_cmd}\n"
-                        GLib.idle_add(
-                            lambda: progress_item.terminal_buffer.insert(
-                                progress_item.terminal_buffer.get_end_iter(),
-                                highlight_text,
-                            )
-                        )
-
-                if source == "stderr":
-                    # Original stderr processing for other patterns
-                    # Check if the process was cancelled
-                    if progress_item.was_cancelled():
-                        print("Process was cancelled, stopping monitor thread")
-                        GLib.idle_add(
-                            progress_item.add_output_text,
-                            _("Process cancelled by user"),
-                        )
-                        break
-
-                    # Capture output file if available
-                    if "Output #0" in line and "'" in line:
-                        output_match = output_file_pattern.search(line)
-                        if output_match:
-                            output_file = output_match.group(1)
+                        ui.append_output(highlight_text)
+
+                # Check if the process was cancelled
+                if progress_item.was_cancelled():
+                    print("Process was cancelled, stopping monitor thread")
+                    ui.append_output(_("Process cancelled by user"))
+                    break
+
+                # Capture output file if available
+                if "output" in found:
+                    output_file = found["output"].group("output_value")
+                    if output_file:
+                        if _DEBUG:
                             print(f"Detected output file: {output_file}")
-                            GLib.idle_add(
-                                progress_item.add_output_text,
-                                f"Output file: {output_file}",
-                            )
+                        ui.append_output(f"Output file: {output_file}")
 
-                    # Extract video frame rate from input stream info
-                    if video_fps is None and "Stream #" in line and "Video:" in line:
-                        # Try primary pattern first
-                        fps_match = video_fps_pattern.search(line)
-                        if fps_match:
-                            try:
-                                video_fps = float(fps_match.group(1))
+                # Extract video frame rate from input stream info
+                if (
+                    video_fps is None
+                    and head.startswith("Stream #")
+                    and "Video:" in line
+                ):
+                    # Try primary pattern first
+                    fps_match = found.get("video_fps")
+                    if fps_match:
+                        try:
+                            video_fps = float(fps_match.group("video_fps_value"))
+                            if _DEBUG:
                                 print(f"Detected video frame rate: {video_fps} fps")
-                                GLib.idle_add(
-                                    progress_item.add_output_text,
-                                    f"Detected video frame rate: {video_fps} fps",
-                                )
-                            except (ValueError, TypeError) as e:
-                                print(f"Error converting fps: {e}")
-                        else:
-                            # Try alternative pattern
-                            alt_match = alt_fps_pattern.search(line)
-                            if alt_match:
-                                try:
-                                    video_fps = float(alt_match.group(1))
+                            ui.append_output(
+                                f"Detected video frame rate: {video_fps} fps"
+                            )
+                        except (ValueError, TypeError) as e:
+                            print(f"Error converting fps: {e}")
+                    else:
+                        # Try alternative pattern
+                        alt_match = _ALT_FPS_RE.search(line)
+                        if alt_match:
+                            try:
+                                video_fps = float(alt_match.group(1))
+                                if _DEBUG:
                                     print(
                                         f"Detected video frame rate (alt pattern): {video_fps} fps"
                                     )
-                                    GLib.idle_add(
-                                        progress_item.add_output_text,
-                                        f"Detected video frame rate: {video_fps} fps",
-                                    )
-                                except (ValueError, TypeError) as e:
-                                    print(f"Error converting fps (alt pattern): {e}")
-
-                    # Extract duration if not already done
-                    if not duration_detected and "Duration" in line:
-                        duration_match = duration_pattern.search(line)
-                        if duration_match:
-                            try:
-                                duration_str = duration_match.group(1)
-                                h, m, rest = duration_str.split(":")
-                                s = rest.split(".")[
-                                    0
-                                ]  # Get seconds without milliseconds
-                                ms = rest.split(".")[1] if "." in rest else "0"
-
-                                # Calculate duration in seconds with millisecond precision
-                                duration_secs = (
-                                    int(h) * 3600
-                                    + int(m) * 60
-                                    + int(s)
-                                    + (int(ms) / 100)
-                                )
-                                duration_detected = True
-
-                                print(
-                                    f"Detected duration: {duration_str} ({duration_secs:.3f} seconds)"
-                                )
-                                GLib.idle_add(
-                                    progress_item.add_output_text,
-                                    f"Detected duration: {duration_str}",
+                                ui.append_output(
+                                    f"Detected video frame rate: {video_fps} fps"
                                 )
+                            except (ValueError, TypeError) as e:
+                                print(f"Error converting fps (alt pattern): {e}")
+
+                # Extract duration if not already done
+                if not duration_detected and "duration" in found:
+                    duration_match = found["duration"]
+                    duration_str = duration_match.group("duration_value")
+                    # FFmpeg reports hundredths of a second; the pattern only
+                    # admits digits, so the conversion cannot fail
+                    duration_secs = _timestamp_seconds(duration_match, "duration")
+                    duration_detected = True
+
+                    if _DEBUG:
+                        print(
+                            f"Detected duration: {duration_str} ({duration_secs:.3f} seconds)"
+                        )
+                    ui.append_output(f"Detected duration: {duration_str}")
+
+                    # Calculate total frames if we have both duration and fps
+                    if video_fps is not None and video_fps > 0:
+                        # Sanity check - make sure fps is reasonable (1-120)
+                        if 1 <= video_fps <= 120:
+                            total_frames = int(duration_secs * video_fps)
+                            if _DEBUG:
+                                print(f"Estimated total frames: {total_frames}")
+                            ui.append_output(f"Estimated total frames: {total_frames}")
+                        elif _DEBUG:
+                            print(
+                                f"Unreasonable fps detected: {video_fps}, not calculating total frames"
+                            )
 
-                                # Calculate total frames if we have both duration and fps
-                                if video_fps is not None and video_fps > 0:
-                                    # Sanity check - make sure fps is reasonable (1-120)
-                                    if 1 <= video_fps <= 120:
-                                        total_frames = int(duration_secs * video_fps)
-                                        print(f"Estimated total frames: {total_frames}")
-                                        GLib.idle_add(
-                                            progress_item.add_output_text,
-                                            f"Estimated total frames: {total_frames}",
-                                        )
-                                    else:
-                                        print(
-                                            f"Unreasonable fps detected: {video_fps}, not calculating total frames"
-                                        )
-                            except Exception as e:
-                                print(f"Error parsing duration: {e}")
-
-                # Process frame counts from either stream
-                if "frame=" in line:
-                    frame_match = frame_pattern.search(line)
+                # Process frame counts
+                if "frame" in found:
+                    frame_match = found["frame"]
                     if frame_match:
                         try:
-                            current_frame = int(frame_match.group(1))
+                            current_frame = int(frame_match.group("frame_value"))
                             max_current_frame = max(max_current_frame, current_frame)
 
-                            # Get info about current fps
-                            current_fps = None
-                            fps_match = fps_pattern.search(line)
-                            if fps_match:
-                                try:
-                                    current_fps = float(fps_match.group(1))
-                                except (ValueError, TypeError):
-                                    pass
+                            # Get info about current fps, captured by the same line
+                            # scan as frame=; the pattern only admits valid numbers
+                            fps_match = found.get("fps")
+                            current_fps = (
+                                float(fps_match.group("fps_value")) if fps_match else None
+                            )
 
                             # If we don't have total frames yet but have duration
                             if (
@@ -516,12 +741,12 @@ def monitor_progress(app, process, progress_item):
                                 if current_fps is not None and 1 <= current_fps <= 120:
                                     # Only use current_fps if it's reasonable
                                     total_frames = int(duration_secs * current_fps)
-                                    print(
-                                        f"Estimated total frames from current fps: {total_frames}"
-                                    )
-                                    GLib.idle_add(
-                                        progress_item.add_output_text,
-                                        f"Estimated total frames: {total_frames} (from current fps: {current_fps})",
+                                    if _DEBUG:
+                                        print(
+                                            f"Estimated total frames from current fps: {total_frames}"
+                                        )
+                                    ui.append_output(
+                                        f"Estimated total frames: {total_frames} (from current fps: {current_fps})"
                                     )
 
                             # Sanity check for frame estimate
@@ -532,13 +757,18 @@ def monitor_progress(app, process, progress_item):
                                 # Current frame count exceeds our total estimate by 50% - our estimate is likely wrong
                                 # Recalculate based on observed frame count
                                 if duration_secs and duration_secs > 0:
-                                    processing_time = (
-                                        time.time() - processing_start_time
-                                    )
+                                    processing_time = now - processing_start_time
                                     # Estimate total frames based on elapsed time and observed frame count
                                     if (
                                         processing_time > 5
                                     ):  # Only do this after 5 seconds of processing
+                                        # Take the output position from this same
+                                        # stats line; otherwise it is only set by
+                                        # the time-based fallback and stays 0
+                                        if "time" in found:
+                                            current_time_secs = _timestamp_seconds(
+                                                found["time"], "time"
+                                            )
                                         estimated_total = (
                                             int(
                                                 (current_frame * duration_secs)
@@ -548,13 +778,13 @@ def monitor_progress(app, process, progress_item):
                                             else 0
                                         )
                                         if estimated_total > total_frames:
-                                            print(
-                                                f"Adjusting total frame estimate from {total_frames} to {estimated_total}"
-                                            )
+                                            if _DEBUG:
+                                                print(
+                                                    f"Adjusting total frame estimate from {total_frames} to {estimated_total}"
+                                                )
                                             total_frames = estimated_total
-                                            GLib.idle_add(
-                                                progress_item.add_output_text,
-                                                f"Adjusted total frames estimate to {total_frames}",
+                                            ui.append_output(
+                                                f"Adjusted total frames estimate to {total_frames}"
                                             )
 
                             # Calculate progress based on frames if total_frames is valid
@@ -567,9 +797,7 @@ def monitor_progress(app, process, progress_item):
                                 progress = min(0.99, current_frame / total_frames)
 
                                 # Process time estimation
-                                processing_diff = time.time() - processing_start_time
-                                if len(progress_samples) >= sample_window:
-                                    progress_samples.pop(0)
+                                processing_diff = now - processing_start_time
 
                                 if progress > 0:
                                     # Estimate remaining time
@@ -586,52 +814,31 @@ def monitor_progress(app, process, progress_item):
                                             else "N/A"
                                         )
 
-                                        # Get the friendly encode mode for display
-                                        friendly_mode = encode_mode
-                                        if encode_mode in encode_mode_map:
-                                            friendly_mode = encode_mode_map[encode_mode]
-
-                                        status_msg = f"{_('Speed')}: {fps_display} fps\n{friendly_mode}"
-                                        GLib.idle_add(
-                                            progress_item.update_progress,
-                                            progress,
-                                            f"{int(progress * 100)}%",
-                                        )
-                                        GLib.idle_add(
-                                            progress_item.update_status, status_msg
+                                        status_msg = f"{speed_label} {fps_display} fps\n{friendly_mode}"
+                                        ui.set_progress(
+                                            progress, f"{int(progress * 100)}%"
                                         )
+                                        ui.set_status(status_msg)
 
                             # Fallback to time-based progress if frames approach isn't working
                             elif (
-                                "time=" in line
+                                "time" in found
                                 and duration_secs is not None
                                 and duration_secs > 0
                             ):
-                                time_match = time_pattern.search(line)
+                                time_match = found["time"]
                                 if time_match:
                                     try:
-                                        time_str = time_match.group(1)
-                                        h, m, rest = time_str.split(":")
-                                        s = rest.split(".")[
-                                            0
-                                        ]  # Get seconds without milliseconds
-                                        ms = rest.split(".")[1] if "." in rest else "0"
-
                                         # Calculate current time in seconds
-                                        current_time_secs = (
-                                            int(h) * 3600
-                                            + int(m) * 60
-                                            + int(s)
-                                            + (int(ms) / 100)
+                                        current_time_secs = _timestamp_seconds(
+                                            time_match, "time"
                                         )
                                         progress = min(
                                             0.99, current_time_secs / duration_secs
                                         )
 
                                         # Calculate processing time and ETA
-                                        processing_diff = (
-                                            time.time() - processing_start_time
-                                        )
+                                        processing_diff = now - processing_start_time
                                         if progress > 0:
                                             eta_seconds = (
                                                 processing_diff / progress
@@ -644,22 +851,11 @@ def monitor_progress(app, process, progress_item):
                                                 else "N/A"
                                             )
 
-                                            # Get the friendly encode mode for display
-                                            friendly_mode = encode_mode
-                                            if encode_mode in encode_mode_map:
-                                                friendly_mode = encode_mode_map[
-                                                    encode_mode
-                                                ]
-
-                                            status_msg = f"{_('Speed:')} {fps_display} fps\n{friendly_mode}"
-                                            GLib.idle_add(
-                                                progress_item.update_progress,
-                                                progress,
-                                                f"{int(progress * 100)}%",
-                                            )
-                                            GLib.idle_add(
-                                                progress_item.update_status, status_msg
+                                            status_msg = f"{speed_label} {fps_display} fps\n{friendly_mode}"
+                                            ui.set_progress(
+                                                progress, f"{int(progress * 100)}%"
                                             )
+                                            ui.set_status(status_msg)
                                     except Exception as e:
                                         print(f"Error calculating time progress: {e}")
 
@@ -667,18 +863,8 @@ def monitor_progress(app, process, progress_item):
                             else:
                                 # Modified status message for indeterminate progress
                                 if current_fps is not None:
-                                    # Get the friendly encode mode for display
-                                    friendly_mode = encode_mode
-                                    if encode_mode in encode_mode_map:
-                                        friendly_mode = encode_mode_map[encode_mode]
-
-                                    status_msg = f"{_('Speed:')} {current_fps:.1f} fps\n{friendly_mode}"
+                                    status_msg = f"{speed_label} {current_fps:.1f} fps\n{friendly_mode}"
                                 else:
-                                    # Get the friendly encode mode for display
-                                    friendly_mode = encode_mode
-                                    if encode_mode in encode_mode_map:
-                                        friendly_mode = encode_mode_map[encode_mode]
-
                                     status_msg = f"{friendly_mode}"
 
                                 # Use an arbitrary progress value based on frames processed
@@ -688,34 +874,45 @@ def monitor_progress(app, process, progress_item):
                                         (current_frame / (max_current_frame + 1000))
                                         + 0.01,
                                     )
-                                    GLib.idle_add(
-                                        progress_item.update_progress,
-                                        arbitrary_progress,
-                                    )
+                                    ui.set_progress(arbitrary_progress)
                                 else:
-                                    GLib.idle_add(progress_item.update_progress, 0.01)
+                                    ui.set_progress(0.01)
 
-                                GLib.idle_add(progress_item.update_status, status_msg)
+                                ui.set_status(status_msg)
 
                         except Exception as e:
                             print(f"Error processing frame progress: {e}")
 
             except Exception as e:
-                if not isinstance(e, Empty):  # Don't log Empty exceptions
-                    print(f"Error processing output line: {e}")
-                    import traceback
+                print(f"Error processing output line: {e}")
+                import traceback
 
-                    traceback.print_exc()
+                traceback.print_exc()
 
     except (BrokenPipeError, IOError) as e:
-        # This can happen if the process is killed during readline
+        # This can happen if the process is killed during a read
         error_msg = f"Process pipe error: {e} - process likely terminated"
         print(error_msg)
-        GLib.idle_add(progress_item.add_output_text, error_msg)
+        ui.append_output(error_msg)
     except Exception as e:
         error_msg = f"Error reading process output: {e}"
         print(error_msg)
-        GLib.idle_add(progress_item.add_output_text, error_msg)
+        ui.append_output(error_msg)
+    finally:
+        selector.close()
+
+    # Apply pending updates before the completion updates queued below
+    ui.stop()
+
+    # Completion updates are collected and applied in one main-loop dispatch.
+    # Delayed callbacks get the conversion id rather than the item widget, so
+    # they don't keep it alive
+    updates = []
+    conversion_id = progress_item.conversion_id
+    messages = _get_messages()
+
+    def defer(func, *args, **kwargs):
+        updates.append((func, args, kwargs))
 
     # Process finished or was canceled
     try:
@@ -731,76 +928,78 @@ def monitor_progress(app, process, progress_item):
 
                     # Wait with timeout to avoid hanging
                     try:
-                        process.wait(timeout=2)
+                        _wait_for_exit(process, 2)
                         term_msg = "Process terminated after cancellation"
                         print(term_msg)
-                        GLib.idle_add(progress_item.add_output_text, term_msg)
+                        defer(progress_item.add_output_text, term_msg)
                     except subprocess.TimeoutExpired:
                         error_msg = "Process didn't terminate within timeout, may still be running"
                         print(error_msg)
-                        GLib.idle_add(progress_item.add_output_text, error_msg)
+                        defer(progress_item.add_output_text, error_msg)
 
                         # As a last resort, try to kill any orphaned ffmpeg processes with the same input file
-                        if (
-                            hasattr(progress_item, "input_file_path")
-                            and progress_item.input_file_path
-                        ):
+                        if progress_item.input_file:
                             try:
-                                # Create a safe version of the filename to use in grep
-                                safe_filename = os.path.basename(
-                                    progress_item.input_file_path
-                                ).replace("'", "'\\''")
-                                kill_cmd = f"pkill -KILL -f 'ffmpeg.*{safe_filename}'"
-                                print(f"Attempting emergency cleanup: {kill_cmd}")
-                                os.system(kill_cmd)
+                                print("Attempting emergency cleanup of ffmpeg processes")
+                                _kill_matching_ffmpeg(progress_item.input_file)
                             except Exception as e:
                                 print(f"Emergency cleanup failed: {e}")
             except Exception as e:
                 error_msg = f"Error killing process after cancellation: {e}"
                 print(error_msg)
-                GLib.idle_add(progress_item.add_output_text, error_msg)
+                defer(progress_item.add_output_text, error_msg)
 
             # Update UI for cancellation
-            cancel_msg = _("Conversion cancelled.")
-            GLib.idle_add(progress_item.update_status, cancel_msg)
-            GLib.idle_add(progress_item.update_progress, 0.0, _("Cancelled"))
-            GLib.idle_add(progress_item.cancel_button.set_sensitive, False)
+            cancel_msg = messages["cancelled"]
+            defer(progress_item.update_status, cancel_msg)
+            defer(progress_item.update_progress, 0.0, messages["cancelled_label"])
+            defer(progress_item.cancel_button.set_sensitive, False)
 
             # Remove conversion item from the page after a delay
-            GLib.timeout_add(
-                2000,
-                lambda: app.progress_page.remove_conversion(
-                    progress_item.conversion_id
-                ),
-            )
+            _schedule_removal(app, conversion_id, 2)
         else:
             # Process finished normally, get return code
             return_code = process.wait()
             finish_msg = f"Process finished with return code: {return_code}"
             print(finish_msg)
-            GLib.idle_add(progress_item.add_output_text, finish_msg)
+            defer(progress_item.add_output_text, finish_msg)
+
+            # Queue items skip the completion dialogs
+            is_queue_processing = progress_item.is_queue_processing
 
             # Update user interface from main thread
             if return_code == 0:
                 # Mark as successful
-                GLib.idle_add(progress_item.mark_success)
+                defer(progress_item.mark_success)
 
                 # Update progress bar
-                GLib.idle_add(progress_item.update_progress, 1.0, _("Completed!"))
-                complete_msg = _("Conversion completed successfully!")
-                GLib.idle_add(progress_item.update_status, complete_msg)
+                defer(progress_item.update_progress, 1.0, messages["completed"])
+                complete_msg = messages["success"]
+                defer(progress_item.update_status, complete_msg)
+
+                # Queue items skip the plain success dialog; the branches below
+                # replace it with a specific message or a warning when needed
+                dialog_msg = None if is_queue_processing else messages["success"]
 
                 # Check if we should delete the original file
                 if progress_item.delete_original and progress_item.input_file:
                     input_file = progress_item.input_file
 
-                    # Check if the output file exists and has a reasonable size
-                    if output_file and os.path.exists(output_file):
-                        input_size = os.path.getsize(input_file)
-                        output_size = os.path.getsize(output_file)
+                    # Check if the output file exists and has a reasonable size;
+                    # one stat per file covers both the existence and size checks
+                    output_stat = None
+                    if output_file:
+                        try:
+                            output_stat = os.stat(output_file)
+                        except OSError:
+                            pass
+
+                    if output_stat:
+                        input_size = os.stat(input_file).st_size
+                        output_size = output_stat.st_size
 
                         size_info = f"Input file size: {input_size} bytes, Output file size: {output_size} bytes"
-                        GLib.idle_add(progress_item.add_output_text, size_info)
+                        defer(progress_item.add_output_text, size_info)
 
                         # Consider the conversion successful if the output file exists with reasonable size
                         # The size should be at least 1MB or 10% of the original size
@@ -809,197 +1008,216 @@ def monitor_progress(app, process, progress_item):
                             try:
                                 os.remove(input_file)
                                 delete_msg = f"Original file deleted: {input_file}"
-                                GLib.idle_add(progress_item.add_output_text, delete_msg)
-                                is_queue_processing = (
-                                    hasattr(progress_item, "is_queue_processing")
-                                    and progress_item.is_queue_processing
-                                )
+                                defer(progress_item.add_output_text, delete_msg)
                                 if not is_queue_processing:
                                     # Only show dialogs for individual conversions (not queue items)
-                                    GLib.idle_add(
-                                        lambda: show_info_dialog_and_close_progress(
-                                            app,
-                                            _(
-                                                "Conversion completed successfully!\n\n"
-                                                "The original file <b>{0}</b> was deleted."
-                                            ).format(os.path.basename(input_file)),
-                                            progress_item,
-                                        )
-                                    )
+                                    dialog_msg = _(
+                                        "Conversion completed successfully!\n\n"
+                                        "The original file <b>{0}</b> was deleted."
+                                    ).format(os.path.basename(input_file))
                             except Exception as e:
                                 error_msg = f"Could not delete the original file: {e}"
-                                GLib.idle_add(progress_item.add_output_text, error_msg)
-                                GLib.idle_add(
-                                    lambda e=e: show_info_dialog_and_close_progress(
-                                        app,
-                                        _(
-                                            "Conversion completed successfully!\n\n"
-                                            "Could not delete the original file: {0}"
-                                        ).format(e),
-                                        progress_item,
-                                    )
-                                )
+                                defer(progress_item.add_output_text, error_msg)
+                                dialog_msg = _(
+                                    "Conversion completed successfully!\n\n"
+                                    "Could not delete the original file: {0}"
+                                ).format(e)
                         else:
                             size_warning = "The original file was not deleted because the converted file size looks suspicious."
-                            GLib.idle_add(progress_item.add_output_text, size_warning)
-                            GLib.idle_add(
-                                lambda: show_info_dialog_and_close_progress(
-                                    app,
-                                    _(
-                                        "Conversion completed successfully!\n\n"
-                                        "The original file was not deleted because the converted file size looks suspicious."
-                                    ),
-                                    progress_item,
-                                )
+                            defer(progress_item.add_output_text, size_warning)
+                            dialog_msg = _(
+                                "Conversion completed successfully!\n\n"
+                                "The original file was not deleted because the converted file size looks suspicious."
                             )
                     else:
                         output_warning = (
                             f"Output file not found or not accessible: {output_file}"
                         )
-                        GLib.idle_add(progress_item.add_output_text, output_warning)
-                        GLib.idle_add(
-                            lambda: show_info_dialog_and_close_progress(
-                                app,
-                                _("Conversion completed successfully!"),
-                                progress_item,
-                            )
-                        )
-                else:
-                    # Only show completion dialog if not processing a queue
-                    is_queue_processing = (
-                        hasattr(progress_item, "is_queue_processing")
-                        and progress_item.is_queue_processing
-                    )
-                    if not is_queue_processing:
-                        GLib.idle_add(
-                            lambda: show_info_dialog_and_close_progress(
-                                app,
-                                _("Conversion completed successfully!"),
-                                progress_item,
-                            )
-                        )
-                    else:
-                        # For queue items, just remove from progress page after delay without dialog
-                        GLib.timeout_add(
-                            3000,
-                            lambda: app.progress_page.remove_conversion(
-                                progress_item.conversion_id
-                            ),
-                        )
+                        defer(progress_item.add_output_text, output_warning)
+                        dialog_msg = messages["success"]
 
-                # Clean up progress page regardless
-                GLib.timeout_add(
-                    5000,
-                    lambda: app.progress_page.remove_conversion(
-                        progress_item.conversion_id
-                    ),
-                )
+                # One dialog or, for quiet queue items, one delayed removal
+                if dialog_msg:
+                    defer(show_dialog_and_close_progress, app, dialog_msg, conversion_id)
+                else:
+                    # For queue items, just remove from progress page after delay without dialog
+                    _schedule_removal(app, conversion_id, 3)
 
                 # CRITICAL: Notify the app that conversion is complete to trigger next queue item
-                # This must be called directly with idle_add for reliable behavior
-                GLib.idle_add(lambda: app.conversion_completed(True))
+                # Sent ahead of the batched UI updates so the next item starts sooner
+                GLib.idle_add(
+                    app.conversion_completed, True, priority=GLib.PRIORITY_HIGH_IDLE
+                )
 
             else:
-                error_msg = _("Conversion failed with code {0}").format(return_code)
-                GLib.idle_add(progress_item.update_progress, 0.0, _("Error!"))
-                GLib.idle_add(progress_item.update_status, error_msg)
-                GLib.idle_add(progress_item.add_output_text, error_msg)
-
-                # Update to check for queue processing here too
-                is_queue_processing = (
-                    hasattr(progress_item, "is_queue_processing")
-                    and progress_item.is_queue_processing
-                )
+                error_msg = messages["failed"].format(return_code)
+                defer(progress_item.update_progress, 0.0, messages["error"])
+                defer(progress_item.update_status, error_msg)
+                defer(progress_item.add_output_text, error_msg)
+
                 if not is_queue_processing:
-                    GLib.idle_add(
-                        lambda: show_error_dialog_and_close_progress(
-                            app,
-                            _(
-                                "The conversion failed with error code {0}.\n\n"
-                                "Check the log for more details."
-                            ).format(return_code),
-                            progress_item,
-                        )
+                    # Formatted here on the monitor thread, not in the main loop
+                    dialog_msg = messages["failed_dialog"].format(return_code)
+                    defer(
+                        show_dialog_and_close_progress,
+                        app,
+                        dialog_msg,
+                        conversion_id,
+                        error=True,
                     )
                 else:
                     # Just remove the item after a delay without showing dialog
-                    GLib.timeout_add(
-                        5000,
-                        lambda: app.progress_page.remove_conversion(
-                            progress_item.conversion_id
-                        ),
-                    )
+                    _schedule_removal(app, conversion_id, 5)
 
                 # CRITICAL: Notify the app about failed conversion as well
-                GLib.idle_add(lambda: app.conversion_completed(False))
+                GLib.idle_add(
+                    app.conversion_completed, False, priority=GLib.PRIORITY_HIGH_IDLE
+                )
 
             # Disable cancel button
-            GLib.idle_add(progress_item.cancel_button.set_sensitive, False)
+            defer(progress_item.cancel_button.set_sensitive, False)
     finally:
         # Always decrement the conversion counter - even if exceptions occur
-        app.conversions_running -= 1
-        completion_msg = (
-            f"Conversion finished, active conversions: {app.conversions_running}"
-        )
-        print(completion_msg)
-        GLib.idle_add(progress_item.add_output_text, completion_msg)
+        with app.conversions_lock:
+            app.conversions_running -= 1
+            remaining = app.conversions_running
+        completion_msg = f"Conversion finished, active conversions: {remaining}"
+        if _DEBUG:
+            print(completion_msg)
+        # Shown in the log view as part of the single batched completion update
+        defer(progress_item.add_output_text, completion_msg)
+        GLib.idle_add(_apply_ui_updates, updates)
+
+
+def _apply_ui_updates(updates):
+    """Apply a batch of (function, args, kwargs) UI calls from a single idle callback"""
+    for func, args, kwargs in updates:
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            print(f"Error applying UI update: {e}")
+    return False  # Remove from idle queue
+
+
+def _schedule_removal(app, conversion_id, seconds):
+    """Remove a conversion item from the progress page after a delay in seconds"""
+    # Second-granularity timers let GLib coalesce wakeups with other sources;
+    # removing the widget is cosmetic, so it yields to other pending work
+    # The bound method is resolved now instead of when the timer fires
+    remove = app.progress_page.remove_conversion
+    GLib.timeout_add_seconds(
+        seconds, _remove_conversion, remove, conversion_id, priority=GLib.PRIORITY_LOW
+    )
 
 
-def show_info_dialog_and_close_progress(app, message, progress_item):
-    """Shows an information dialog"""
-    # Remove the item from the progress page after a delay
-    GLib.timeout_add(
-        5000, lambda: app.progress_page.remove_conversion(progress_item.conversion_id)
-    )
-    app.show_info_dialog(_("Information"), message)
+def _remove_conversion(remove, conversion_id):
+    """One-shot timeout callback for _schedule_removal"""
+    remove(conversion_id)
+    return GLib.SOURCE_REMOVE
+
 
+def _wait_for_exit(process, timeout):
+    """Wait up to timeout seconds for process to exit and reap it.
 
-def show_error_dialog_and_close_progress(app, message, progress_item):
-    """Shows an error dialog"""
+    Popen.wait(timeout) polls waitpid with sleeps in between; a pidfd becomes
+    readable the moment the child exits, so one poll() covers the wait where
+    the kernel supports it. Raises subprocess.TimeoutExpired like Popen.wait.
+    """
+    if process.poll() is not None:
+        return process.returncode
+    try:
+        pidfd = os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        # No pidfd support (Python < 3.9, kernel < 5.3 or not Linux)
+        return process.wait(timeout=timeout)
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        if not poller.poll(timeout * 1000):
+            raise subprocess.TimeoutExpired(process.args, timeout)
+    finally:
+        os.close(pidfd)
+    return process.wait()
+
+
+def _kill_matching_ffmpeg(input_path):
+    """SIGKILL every ffmpeg process that has input_path as one of its arguments.
+
+    Scans /proc directly, so no shell or pkill has to be spawned and the path
+    never needs quoting. Processes that exit mid-scan are skipped.
+    """
+    target = os.fsencode(os.path.abspath(input_path))
+    own_pid = os.getpid()
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit() or int(entry) == own_pid:
+            continue
+        try:
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                args = f.read().split(b"\0")
+        except OSError:
+            continue
+        if b"ffmpeg" in os.path.basename(args[0]) and _has_path_argument(
+            entry, args[1:], target
+        ):
+            try:
+                os.kill(int(entry), signal.SIGKILL)
+                print(f"Killed orphaned ffmpeg process {entry}")
+            except OSError:
+                pass
+
+
+def _has_path_argument(pid, args, target):
+    """Check whether one of a process's arguments resolves to the absolute target"""
+    file_name = os.path.basename(target)
+    cwd = None
+    for arg in args:
+        # Only arguments naming the same file are worth resolving
+        if os.path.basename(arg) != file_name:
+            continue
+        if not os.path.isabs(arg):
+            # Relative arguments are relative to that process's directory
+            if cwd is None:
+                try:
+                    cwd = os.fsencode(os.readlink(f"/proc/{pid}/cwd"))
+                except OSError:
+                    return False
+            arg = os.path.join(cwd, arg)
+        if os.path.normpath(arg) == target:
+            return True
+    return False
+
+
+def show_dialog_and_close_progress(app, message, conversion_id, error=False):
+    """Shows an information or error dialog"""
     # Remove the item from the progress page after a delay
-    GLib.timeout_add(
-        5000, lambda: app.progress_page.remove_conversion(progress_item.conversion_id)
-    )
-    app.show_error_dialog(message)
+    _schedule_removal(app, conversion_id, 5)
+    if error:
+        app.show_error_dialog(message)
+    else:
+        app.show_info_dialog(_("Information"), message)
 
 
 def build_convert_command(input_file, settings):
     """Build the convert command and environment variables"""
-    cmd = [CONVERT_SCRIPT_PATH, input_file]
-    env_vars = os.environ.copy()
+    # The command is never extended, so a tuple is enough; Popen accepts it
+    cmd = (CONVERT_SCRIPT_PATH, input_file)
+    # Collect only the script's variables; they are merged over the
+    # environment once on return
+    env_vars = {}
+
+    # Look up the accessor once; settings may be a manager or a plain dict
+    get_setting = (
+        settings.get_value if hasattr(settings, "get_value") else settings.get
+    )
 
-    # Direct mapping of settings to environment variables
-    # These are the environment variables expected by the conversion script
-    setting_keys = [
-        "gpu",
-        "video-quality",
-        "video-codec",
-        "preset",
-        "subtitle-extract",
-        "audio-handling",
-        "audio-bitrate",
-        "audio-channels",
-        "video-resolution",
-        "additional-options",
-        "gpu-partial",
-        "force-copy-video",
-        "only-extract-subtitles",
-        "output-folder",
-    ]
-
-    # Just convert dashes to underscores for environment variable names
-    for key in setting_keys:
-        value = (
-            settings.get_value(key)
-            if hasattr(settings, "get_value")
-            else settings.get(key)
-        )
+    for key, env_key in _CONVERT_SETTING_ENV_KEYS:
+        value = get_setting(key)
 
         # Skip empty values
         if value not in [None, "", False]:
-            env_key = key.replace("-", "_")
             env_vars[env_key] = str(value)
-            print(f"Setting {env_key}={value}")
+            if _DEBUG:
+                print(f"Setting {env_key}={value}")
 
     # Add trim times to environment variables
     trim_start = settings.get_value("video-trim-start")
@@ -1007,17 +1225,18 @@ def build_convert_command(input_file, settings):
 
     if trim_start > 0:
         env_vars["trim_start"] = str(trim_start)
-        print(f"Setting trim_start={trim_start}")
+        if _DEBUG:
+            print(f"Setting trim_start={trim_start}")
 
     if trim_end > 0:
         env_vars["trim_end"] = str(trim_end)
-        print(f"Setting trim_end={trim_end}")
+        if _DEBUG:
+            print(f"Setting trim_end={trim_end}")
 
     # Set default output folder if not specified
     if "output_folder" not in env_vars and input_file:
-        env_vars["output_folder"] = os.path.dirname(input_file)
-        print(
-            f"Setting output folder to input file directory: {env_vars['output_folder']}"
-        )
+        output_folder = env_vars["output_folder"] = os.path.dirname(input_file)
+        if _DEBUG:
+            print(f"Setting output folder to input file directory: {output_folder}")
 
-    return cmd, env_vars
+    return cmd, {**os.environ, **env_vars}